@@ -4,15 +4,29 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse, FileResponse
 from routes.validator import router as validator_router
 from models.schemas import HealthResponse
-from services.agent_service import get_agent_service
+from services.agent_service import get_agent_service, shutdown_agent_service, warm_up_agent_service
+from contextlib import asynccontextmanager
+import asyncio
 import os
 from pathlib import Path
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App lifecycle: the Backboard client keeps one connection pool for the process."""
+    # In the background, so a slow or unreachable Backboard doesn't hold up startup
+    warm_up = asyncio.create_task(warm_up_agent_service())
+    yield
+    warm_up.cancel()
+    await shutdown_agent_service()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Startup Idea Validator",
     description="AI-powered startup idea validation using Backboard.io",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend communication
@@ -25,18 +39,14 @@ app.add_middleware(
 )
 
 
-# Error handling middleware
-@app.middleware("http")
-async def error_handler_middleware(request: Request, call_next):
-    """Global error handling middleware"""
-    try:
-        response = await call_next(request)
-        return response
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": f"Internal server error: {str(e)}"}
-        )
+# Global error handler (runs only when a request fails, not around every request)
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Return unhandled errors as JSON 500 responses"""
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": f"Internal server error: {str(exc)}"}
+    )
 
 
 # Include routers
@@ -96,10 +106,19 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
     
+    # ENV=dev: single auto-reloading process. Otherwise run multiple workers
+    # without per-request access logging; the "auto" loop/http pick uvloop and
+    # httptools when installed (uvicorn[standard]).
+    dev_mode = os.getenv("ENV") == "dev"
+    
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=True,
+        reload=dev_mode,
+        workers=1 if dev_mode else int(os.getenv("UVICORN_WORKERS", 4)),
+        loop="auto",
+        http="auto",
+        access_log=dev_mode,
         log_level="info"
     )
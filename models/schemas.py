@@ -7,6 +7,8 @@ class StressTestRequest(BaseModel):
     """Idea stress test request"""
     idea: str = Field(..., min_length=10, description="The startup idea to test")
     selected_critics: Optional[List[str]] = Field(default=None, description="List of specific critics to run (e.g. ['vc', 'engineer'])")
+    use_cache: bool = Field(default=True, description="Allow answering from a previous validation of the same idea")
+    force_verdict_llm: bool = Field(default=False, description="Always ask the judge LLM, even when the critics already converge on one risk")
 
 
 class ValidationResponse(BaseModel):
@@ -36,6 +38,12 @@ class FollowUpResponse(BaseModel):
     answer: str = Field(..., description="Answer to the follow-up question")
 
 
+class HistoryResponse(BaseModel):
+    """Conversation history response"""
+    thread_id: str = Field(..., description="Thread ID for this conversation")
+    messages: List[Dict[str, Any]] = Field(..., description="Messages in the thread, oldest first (role, content, created_at)")
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Service status")
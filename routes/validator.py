@@ -1,14 +1,96 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
 from models.schemas import (
     StressTestRequest,
     ValidationResponse,
     FollowUpRequest,
-    FollowUpResponse
+    FollowUpResponse,
+    HistoryResponse
 )
-from services.agent_service import get_agent_service
+from services.agent_service import AgentService, get_agent_service
+from services.cache import LRUCache
 
 router = APIRouter(prefix="/api", tags=["validator"])
 
+logger = logging.getLogger(__name__)
+
+# Completed validations keyed by the canonicalized request, so resubmitting the
+# same idea (common while iterating or demoing) skips the whole LLM pipeline.
+_validation_cache = LRUCache(
+    maxsize=int(os.getenv("VALIDATION_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("VALIDATION_CACHE_TTL", 3600))
+)
+
+
+def _validation_cache_key(request: StressTestRequest, agent: AgentService) -> str:
+    """Hash the request with the idea case/whitespace-folded and the critic selection order-free."""
+    payload = {
+        "idea": agent.fold_text(request.idea),
+        "selected_critics": sorted(set(request.selected_critics)) if request.selected_critics is not None else None,
+        "force_verdict_llm": request.force_verdict_llm,
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+# Validations currently running, by cache key. Identical concurrent submissions
+# await the same task instead of each starting their own LLM pipeline.
+_inflight_validations: Dict[str, "asyncio.Future[ValidationResponse]"] = {}
+
+
+async def _get_cached_validation(agent: AgentService, cache_key: str) -> Optional[ValidationResponse]:
+    """Look in this worker's cache, then in the shared backend (REDIS_URL) if there is one."""
+    cached = _validation_cache.get(cache_key)
+    if cached is not None or not agent.llm_cache.shared:
+        return cached
+    try:
+        stored = await agent.llm_cache.get("validation:" + cache_key)
+    except Exception as e:
+        logger.warning("Shared validation cache read failed: %s", e)
+        return None
+    if stored is None:
+        return None
+    response = ValidationResponse.model_validate_json(stored)
+    _validation_cache.set(cache_key, response)
+    return response
+
+
+async def _run_validation(agent: AgentService, request: StressTestRequest, cache_key: str) -> ValidationResponse:
+    result = await agent.run_stress_test(
+        idea_text=request.idea,
+        selected_critics=request.selected_critics,
+        force_verdict_llm=request.force_verdict_llm,
+        use_cache=request.use_cache
+    )
+    response = ValidationResponse(**result)
+    if response.meta.get("degraded"):
+        # Some critics gave up; let the next submission try them again
+        return response
+    _validation_cache.set(cache_key, response)
+    if agent.llm_cache.shared:
+        try:
+            await agent.llm_cache.set(
+                "validation:" + cache_key,
+                response.model_dump_json(),
+                ttl=int(_validation_cache.ttl)
+            )
+        except Exception as e:
+            logger.warning("Shared validation cache write failed: %s", e)
+    return response
+
+
+async def _with_own_thread(
+    agent: AgentService, response: ValidationResponse, request: StressTestRequest
+) -> ValidationResponse:
+    """A cached or shared result, moved to a fresh thread for this submitter (and their own wording)."""
+    thread_id = await agent.fork_thread(response.model_dump())
+    return response.model_copy(update={"thread_id": thread_id, "input_idea": request.idea})
+
 
 @router.post("/validate", response_model=ValidationResponse, status_code=status.HTTP_200_OK)
 async def validate_startup_idea(request: StressTestRequest):
@@ -17,14 +99,27 @@ async def validate_startup_idea(request: StressTestRequest):
     """
     try:
         agent = get_agent_service()
+
+        cache_key = _validation_cache_key(request, agent)
+        if request.use_cache:
+            cached = await _get_cached_validation(agent, cache_key)
+            if cached is not None:
+                return await _with_own_thread(agent, cached, request)
         
-        # Run stress test (async)
-        result = await agent.run_stress_test(
-            idea_text=request.idea,
-            selected_critics=request.selected_critics
-        )
+        # Run stress test (async), joining an identical run already in flight.
+        # use_cache=false always starts a fresh run (its result still refreshes the cache).
+        task = _inflight_validations.get(cache_key) if request.use_cache else None
+        joined = task is not None
+        if not joined:
+            task = asyncio.ensure_future(_run_validation(agent, request, cache_key))
+            _inflight_validations[cache_key] = task
+            task.add_done_callback(
+                lambda t: _inflight_validations.pop(cache_key) if _inflight_validations.get(cache_key) is t else None
+            )
         
-        return ValidationResponse(**result)
+        # Shielded so one client disconnecting doesn't cancel the run for the others
+        response = await asyncio.shield(task)
+        return await _with_own_thread(agent, response, request) if joined else response
         
     except ValueError as e:
         raise HTTPException(
@@ -38,6 +133,37 @@ async def validate_startup_idea(request: StressTestRequest):
         )
 
 
+@router.post("/validate/stream", status_code=status.HTTP_200_OK)
+async def stream_startup_idea_validation(request: StressTestRequest):
+    """
+    Stress test a startup idea, streaming NDJSON events as each phase completes.
+    The final "done" event carries the same payload as /validate.
+    """
+    try:
+        agent = get_agent_service()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    async def event_stream():
+        try:
+            async for event in agent.iter_stress_test(
+                idea_text=request.idea,
+                selected_critics=request.selected_critics,
+                stream_verdict=True,
+                force_verdict_llm=request.force_verdict_llm,
+                use_cache=request.use_cache
+            ):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            # Headers are already sent, so report failures in-band
+            yield json.dumps({"phase": "error", "detail": f"Error validating idea: {str(e)}"}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.post("/follow-up", response_model=FollowUpResponse, status_code=status.HTTP_200_OK)
 async def ask_follow_up_question(request: FollowUpRequest):
     """
@@ -69,20 +195,51 @@ async def ask_follow_up_question(request: FollowUpRequest):
         )
 
 
-@router.get("/history/{thread_id}")
+@router.get("/meta/models")
+async def get_models_meta():
+    """
+    Return the provider/model configured for each persona.
+    The configuration is fixed at startup, so the pre-encoded JSON is served as-is.
+    """
+    try:
+        agent = get_agent_service()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return Response(
+        content=agent.models_json,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+@router.get("/history/{thread_id}", response_model=HistoryResponse)
 async def get_validation_history(thread_id: str):
     """
-    Retrieve the conversation history for a validation thread.
-    (Wrapped directly from SDK if possible, or implemented in service)
+    Retrieve the conversation history for a validation thread
     """
-    # Note: AgentService currently doesn't expose history listing. 
-    # For now we return not implemented or basic info.
-    # To strictly follow "new code", we might omit this if not requested, 
-    # but to support existing frontend we can try.
-    
-    # Simple workaround: The new code didn't focus on history.
-    # We'll just return the thread_id to not break the route, 
-    # or better, implement a passthrough in agent_service if SDK supports it.
-    
-    # For now, let's keep it minimal as per user request to use "new code approach".
-    return {"thread_id": thread_id, "messages": "History retrieval not yet implemented in Agentic mode."}
+    try:
+        agent = get_agent_service()
+
+        messages = await agent.get_history(thread_id)
+
+        return HistoryResponse(thread_id=thread_id, messages=messages)
+
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving history: {str(e)}"
+        )
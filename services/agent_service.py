@@ -1,17 +1,276 @@
 import os
 import re
 import asyncio
-from typing import Dict, Any, List, Optional
+import functools
+import hashlib
+import heapq
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, NamedTuple, Optional, Set, Tuple
 from dotenv import load_dotenv
 
+from services.cache import LRUCache, make_cache_backend
+
 # Use backboard module
 try:
-    from backboard import BackboardClient
+    from backboard import (
+        BackboardAPIError,
+        BackboardClient,
+        BackboardNotFoundError,
+        BackboardRateLimitError,
+        BackboardServerError,
+        BackboardValidationError,
+    )
+    _RETRYABLE_ERRORS: Tuple[type, ...] = (BackboardServerError, BackboardRateLimitError)
 except ImportError:
     BackboardClient = None
+    BackboardNotFoundError = LookupError
+    BackboardValidationError = ValueError
+    BackboardAPIError = None
+    _RETRYABLE_ERRORS = ()
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# --- Model Configurations ---
+# Read from the environment once at import; shared by every AgentService.
+# Refactored to use OpenAI GPT-4o for all personas
+_DEFAULT_PROVIDER = "openai"
+_DEFAULT_MODEL = "gpt-4o"
+
+_MODELS: Dict[str, Dict[str, str]] = {
+    "main": {
+        "llm_provider": os.getenv("LLM_PROVIDER_MAIN", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_MAIN", _DEFAULT_MODEL),
+    },
+    "vc": {
+        "llm_provider": os.getenv("LLM_PROVIDER_VC", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_VC", _DEFAULT_MODEL),
+    },
+    "engineer": {
+        "llm_provider": os.getenv("LLM_PROVIDER_ENGINEER", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_ENGINEER", _DEFAULT_MODEL),
+    },
+    "ethicist": {
+        "llm_provider": os.getenv("LLM_PROVIDER_ETHICIST", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_ETHICIST", _DEFAULT_MODEL),
+    },
+    "user": {
+        "llm_provider": os.getenv("LLM_PROVIDER_USER", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_USER", _DEFAULT_MODEL),
+    },
+    "competitor": {
+        "llm_provider": os.getenv("LLM_PROVIDER_COMPETITOR", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_COMPETITOR", _DEFAULT_MODEL),
+    },
+    "market_analyst": {
+        "llm_provider": os.getenv("LLM_PROVIDER_MARKET", _DEFAULT_PROVIDER),
+        "model_name": os.getenv("MODEL_MARKET", _DEFAULT_MODEL),
+    },
+}
+
+# Extra add_message options per call site: "main" for the idea's own thread
+# (neutralize, assumptions, verdict, follow-ups), "critic" for isolated critics.
+# Backboard memory adds a retrieval/extraction pass to every message; critics
+# are one-shot and must not see other ideas, so it is off for them by default.
+# Unset options are left out so the server default applies.
+_MESSAGE_OPTIONS: Dict[str, Dict[str, Any]] = {
+    role: {key: value for key, value in options.items() if value}
+    for role, options in {
+        "main": {"memory": os.getenv("MEMORY_MAIN")},
+        "critic": {"memory": os.getenv("MEMORY_CRITICS", "off")},
+    }.items()
+}
+
+# Every worker and restart shares the one Backboard assistant with this name
+_ASSISTANT_NAME = "Idea Stress Tester"
+
+# MODELS is fixed for the process lifetime, so encode it once
+_MODELS_JSON = json.dumps(_MODELS).encode()
+
+
+# --- Risk Themes ---
+# Compiled once at import so compute_risk_signals does no regex setup per request.
+
+class _NormTable(dict):
+    """
+    str.translate table for normalize_text: anything that is not [a-z0-9] or
+    whitespace becomes a space. Only ASCII is stored; every other code point maps
+    to a space without being added, so arbitrary user input can't grow the table.
+    """
+
+    def __missing__(self, cp: int) -> int:
+        return 32
+
+
+_NORM_TABLE = _NormTable(
+    (cp, cp if ("a" <= chr(cp) <= "z") or ("0" <= chr(cp) <= "9") or chr(cp).isspace() else 32)
+    for cp in range(128)
+)
+
+_THEME_DEFINITIONS = [
+    {
+        "key": "distribution_adoption",
+        "label": "Distribution / adoption friction",
+        "patterns": ["distribution", "acquisition", "marketing", "onboarding", "adoption", "retention", "growth", re.compile(r"go to market")],
+    },
+    {
+        "key": "trust_credibility",
+        "label": "Trust / credibility",
+        "patterns": ["trust", "credible", "accuracy", "hallucination", "reliability", "confidence", "wrong", "false", "misleading"],
+    },
+    {
+        "key": "privacy_compliance",
+        "label": "Privacy / compliance risk",
+        "patterns": ["privacy", "pii", "gdpr", "hipaa", "consent", "compliance", "data leak", "breach", "sensitive"],
+    },
+    {
+        "key": "security_abuse",
+        "label": "Security / misuse / abuse",
+        "patterns": ["security", "abuse", "misuse", "fraud", "spam", "scam", "attack", "prompt injection", "jailbreak"],
+    },
+    {
+        "key": "moat_competition",
+        "label": "Weak moat / competition will copy",
+        "patterns": ["moat", "defensible", "differentiation", "commodity", "copy", "clone", "competition", "incumbent"],
+    },
+    {
+        "key": "scalability_cost",
+        "label": "Scalability / cost",
+        "patterns": ["scale", "scalability", "latency", "cost", "token", "inference", "throughput", "rate limit"],
+    },
+    {
+        "key": "product_scope",
+        "label": "Too broad / unclear scope",
+        "patterns": ["scope", "too broad", "vague", "unclear", "who is this for", "not specific", "undefined"],
+    },
+]
+
+
+def _compile_theme_patterns(patterns: List[Any]) -> "re.Pattern[str]":
+    """Fold a theme's literal/regex patterns into one alternation."""
+    return re.compile("|".join(re.escape(p) if isinstance(p, str) else p.pattern for p in patterns))
+
+
+class Theme(NamedTuple):
+    """Risk theme with its patterns folded into one compiled regex"""
+    key: str
+    label: str
+    pattern: "re.Pattern[str]"
+
+
+_THEMES = tuple(
+    Theme(th["key"], th["label"], _compile_theme_patterns(th["patterns"]))
+    for th in _THEME_DEFINITIONS
+)
+_THEME_INDEX = {th.key: i for i, th in enumerate(_THEMES)}
+
+# Single-pass scanner: one lookahead alternation with a named group per theme,
+# so each critic is traversed once and every (even overlapping) hit is reported.
+_THEME_SCANNER = re.compile(
+    "(?=" + "|".join(f"(?P<{th.key}>{th.pattern.pattern})" for th in _THEMES) + ")"
+)
+
+# --- Prompts ---
+# Static prompt bodies; only the idea / critic text is substituted per request.
+
+PROMPT_TEMPLATES: Dict[str, str] = {
+    "bias_remover": """Rewrite the idea below in neutral, factual language.\nRules:\n- Remove adjectives, hype, and assumptions of success.\n- Convert vague claims into testable statements.\n- Keep it to 3–6 sentences.\nReturn ONLY the rewritten idea.\n\nIdea:\n{idea}""",
+    "assumptions": """Extract the hidden assumptions that must be true for this idea to succeed.\nRules:\n- Only necessary assumptions (not nice-to-have).\n- Phrase each as falsifiable.\n- 8–12 max.\n\nReturn as a numbered list.\n\nIdea:\n{neutral}""",
+    "neutral_and_assumptions": """Do two steps on the idea below.\n\nSTEP 1: Rewrite the idea in neutral, factual language.\nRules:\n- Remove adjectives, hype, and assumptions of success.\n- Convert vague claims into testable statements.\n- Keep it to 3–6 sentences.\n\nSTEP 2: Extract the hidden assumptions that must be true for the rewritten idea to succeed.\nRules:\n- Only necessary assumptions (not nice-to-have).\n- Phrase each as falsifiable.\n- 8–12 max.\n\nReturn exactly this format and nothing else:\n===NEUTRAL===\n(the rewritten idea)\n===ASSUMPTIONS===\n(the assumptions as a numbered list)\n\nIdea:\n{idea}""",
+    "vc": """Persona: Skeptical VC\nAttack: market size, moat, monetization\n\nDeliver exactly:\n- MARKET RISKS: (2 bullets)\n- MOAT & DEFENSE: (2 bullets)\n- KILL SIGNAL: (1 metric that proves this is dead)\n- ONE RECOMMENDATION: (1 specific action)\n\nBe blunt and specific.\n\nIdea:\n{neutral}""",
+    "engineer": """Persona: Senior Engineer\nAttack: scalability, edge cases, reliability\n\nDeliver exactly:\n- SYSTEM RISKS: (2 bullets)\n- EDGE CASES: (2 bullets)\n- SCALING BOTTLENECK: (1 specific bottleneck)\n- MINIMUM BUILD: (1 critical feature to build first)\n\nBe concrete. No generic advice.\n\nIdea:\n{neutral}""",
+    "ethicist": """Persona: Ethicist / Safety Reviewer\nAttack: harm, bias, misuse, privacy\n\nDeliver exactly:\n- HARMS & BIAS: (2 bullets)\n- MISUSE SCENARIOS: (2 bullets)\n- DATA PRIVACY: (1 specific risk)\n- REQUIRED SAFEGUARD: (1 mandatory control)\n\nDon’t moralize. Be practical.\n\nIdea:\n{neutral}""",
+    "user": """Persona: Real User (impatient, skeptical)\nAttack: adoption friction, trust, workflow fit\n\nDeliver exactly:\n- ADOPTION FRICTION: (2 bullets)\n- TRUST ISSUES: (2 bullets)\n- DEALBREAKER: (1 reason I won't sign up)\n- WHAT WOULD CONVINCE ME: (1 feature/change)\n\nIdea:\n{neutral}""",
+    "competitor": """Persona: Competitor Strategy Lead\nAttack: why we’ll crush you\n\nDeliver exactly:\n- COMPETITIVE ADVANTAGE: (2 bullets on why we win)\n- COPYCAT STRATEGY: (2 bullets on how we copy you)\n- YOUR WEAKNESS: (1 critical flaw)\n- DEFENSIVE MOVE: (1 thing you must do)\n\nBe ruthless.\n\nIdea:\n{neutral}""",
+    "market_analyst": """Persona: Elite Market Analyst\nTask: Competitive Landscape & Capital Requirements\n\n1. COMPETITORS:\nList 3-5 **direct functional competitors** that offer the **exact same core value proposition**.\n- Do NOT list generic platforms (e.g., LinkedIn, Google, Indeed) unless they have this specific automation feature natively.\n- Focus on specific startups, Chrome extensions, or AI tools that solve this EXACT problem.\n\nFor each, provide:\n- Name\n- Success Score (1-10)\n- Est. Metric (Revenue, Users, or Valuation)\n- "How they crush you" (1 sentence)\n\nFormat as a Markdown Table.\n\n2. CAPITAL REQUIREMENTS:\nEstimate the round need (Pre-Seed, Seed, Series A) and amount ($X - $Y) to be competitive.\nProvide a 1-sentence rationale.\n\nIdea:\n{neutral}""",
+    "final_judge": """You are an independent hackathon judge.\nSynthesize the critics below into a decisive verdict.\n\nReturn in this exact format:\n\nPRIMARY FAILURE MODE:\n- (one sentence)\n\nTOP 3 ASSUMPTIONS TO TEST:\n1) ...\n2) ...\n3) ...\n\nKILL QUESTION:\n- (one question)\n\nWINNING DEMO ANGLE:\n- (one sentence: how to demo this in 30 seconds)\n\n48-HOUR VALIDATION EXPERIMENT:\n- (one experiment + success metric)\n\nONE PIVOT TO MAKE THIS A WINNER:\n- (one sentence)\n\nINPUTS\nNeutral Idea:\n{neutral}\n\nAssumptions:\n{assume}\n\nVC:\n{vc}\n\nEngineer:\n{engineer}\n\nEthicist:\n{ethicist}\n\nUser:\n{user}\n\nCompetitor:\n{competitor}""",
+}
+
+# Critics quoted in the final verdict prompt ("Skipped" when not run or empty)
+_JUDGE_CRITICS = ("vc", "engineer", "ethicist", "user", "competitor")
+
+
+class _JudgeFields(dict):
+    """format_map fields for final_judge: any critic not supplied renders as "Skipped"."""
+
+    def __missing__(self, key: str) -> str:
+        return "Skipped"
+
+
+# Personas that may share one batched prompt (see BATCH_CRITICS). The market
+# analyst has a different output shape and always runs on its own.
+_BATCHABLE_CRITICS = _JUDGE_CRITICS
+
+# Every critic template ends with the idea; the batch prompt states it once
+_IDEA_SUFFIX = "\n\nIdea:\n{neutral}"
+assert all(PROMPT_TEMPLATES[name].endswith(_IDEA_SUFFIX) for name in _BATCHABLE_CRITICS), \
+    "batchable critic templates must end with _IDEA_SUFFIX"
+
+BATCH_CRITIC_TEMPLATE = """You will answer as several independent personas: {names}.\nTreat each persona separately; do not let one persona's answer influence another.\nStart each persona's answer with its marker line exactly as given (e.g. "=== PERSONA: vc ===") and write nothing before the first marker.\n\n{sections}\n\nIdea (the same for every persona):\n{neutral}"""
+
+# Models often bold a marker or make it a heading (**=== PERSONA: vc ===**, ### === ...)
+_PERSONA_MARKER = re.compile(r"^[ \t#*_]*=== PERSONA: (\w+) ===[ \t*_]*$", re.M)
+
+# Verdict assembled without the judge LLM when the critics already converge on
+# one risk. Same sections as the final_judge output format.
+LOCAL_VERDICT_TEMPLATE = """PRIMARY FAILURE MODE:\n- {failure_mode}\n\nTOP 3 ASSUMPTIONS TO TEST:\n{assumptions}\n\nKILL QUESTION:\n- {kill_question}\n\nWINNING DEMO ANGLE:\n- {demo_angle}\n\n48-HOUR VALIDATION EXPERIMENT:\n- {experiment}\n\nONE PIVOT TO MAKE THIS A WINNER:\n- {pivot}"""
+
+_NUMBERED_LINE = re.compile(r"^\s*\d+[.)]\s*(.+?)\s*$", re.M)
+
+# Section headings when stress test results are recorded in the idea's thread
+_CRITIC_LABELS = {
+    "vc": "VC",
+    "engineer": "Engineer",
+    "ethicist": "Ethicist",
+    "user": "User",
+    "competitor": "Competitor",
+    "market_analyst": "Market Analyst",
+}
+
+
+def _extract(obj: Any, *keys: str) -> Any:
+    """First truthy field among keys, read as an attribute or a dict key (SDK responses vary)."""
+    is_dict = isinstance(obj, dict)
+    for key in keys:
+        value = obj.get(key) if is_dict else getattr(obj, key, None)
+        if value:
+            return value
+    return None
+
+
+def _is_retryable(e: BaseException) -> bool:
+    """
+    Timeouts, 5xx and 429. The SDK also raises the bare BackboardAPIError for other
+    HTTP statuses (401, 403, 422, ...); only the ones without a status code are its
+    own request timeouts and connection errors.
+    """
+    return (
+        isinstance(e, (asyncio.TimeoutError,) + _RETRYABLE_ERRORS)
+        or (
+            BackboardAPIError is not None
+            and type(e) is BackboardAPIError
+            and getattr(e, "status_code", None) is None
+        )
+    )
+
+
+def _critic_field(text: str, label: str) -> Optional[str]:
+    """Pull a single-line section (e.g. "KILL SIGNAL") out of a critic's reply."""
+    m = re.search(
+        rf"{re.escape(label)}[*_]*\s*:[*_]*[ \t]*\n?[ \t]*(?:[-*\u2022][ \t]*)?(\S[^\n]*)",
+        text or "",
+        re.I
+    )
+    return m.group(1).strip(" *_") if m else None
+
+
+def _clause(text: str) -> str:
+    """A critic field without its trailing punctuation, ready to be re-punctuated."""
+    return text.strip().rstrip(" .!?,;:")
+
+
 class AgentService:
     """
     Service for orchestrating the Agentic/Multi-Persona stress test workflow.
@@ -25,75 +284,145 @@ class AgentService:
         if BackboardClient is None:
             raise ImportError("backboard-sdk not installed. Please install it.")
 
-        self.client = BackboardClient(api_key=self.api_key)
         self.assistant_id: Optional[str] = None
+        self._assistant_lock = asyncio.Lock()
+
+        # Neutralized idea + assumptions are pure functions of the idea text,
+        # so repeat submissions can skip both main-model calls.
+        self._neutral_cache = LRUCache(maxsize=int(os.getenv("NEUTRAL_CACHE_SIZE", 256)))
+
+        # Thread histories, briefly cached so rapid frontend polls share one fetch
+        self._history_cache = LRUCache(maxsize=256, ttl=float(os.getenv("HISTORY_CACHE_TTL", 2)))
+
+        # Critic replies keyed by (model, prompt); shared across workers with REDIS_URL
+        self.llm_cache = make_cache_backend()
+        self.llm_cache_ttl = int(os.getenv("LLM_CACHE_TTL", 86400))
+
+        # Background deletes of used critic threads (capped)
+        self._pending_deletes: Set["asyncio.Future[None]"] = set()
+        self._max_pending_deletes = 256
+        # Critic calls (see run_one_shot_async) whose thread is deleted once they finish
+        self._inflight_one_shots: Set["asyncio.Future[Any]"] = set()
+
+        # Upper bound on a single critic call, so one slow model can't stall the wave.
+        # Timeouts and transient errors are retried; a critic that never answers is left empty.
+        self.critic_timeout = float(os.getenv("CRITIC_TIMEOUT", 60))
+        self.critic_attempts = 1 + int(os.getenv("CRITIC_RETRIES", 1))
         
-        # Load Model Configurations
-        # Refactored to use OpenAI GPT-4o for all personas
-        default_provider = "openai"
-        default_model = "gpt-4o"
-
-        self.MODELS = {
-            "main": {
-                "llm_provider": os.getenv("LLM_PROVIDER_MAIN", default_provider),
-                "model_name": os.getenv("MODEL_MAIN", default_model),
-            },
-            "vc": {
-                "llm_provider": os.getenv("LLM_PROVIDER_VC", default_provider),
-                "model_name": os.getenv("MODEL_VC", default_model),
-            },
-            "engineer": {
-                "llm_provider": os.getenv("LLM_PROVIDER_ENGINEER", default_provider),
-                "model_name": os.getenv("MODEL_ENGINEER", default_model),
-            },
-            "ethicist": {
-                "llm_provider": os.getenv("LLM_PROVIDER_ETHICIST", default_provider),
-                "model_name": os.getenv("MODEL_ETHICIST", default_model),
-            },
-            "user": {
-                "llm_provider": os.getenv("LLM_PROVIDER_USER", default_provider),
-                "model_name": os.getenv("MODEL_USER", default_model),
-            },
-            "competitor": {
-                "llm_provider": os.getenv("LLM_PROVIDER_COMPETITOR", default_provider), 
-                "model_name": os.getenv("MODEL_COMPETITOR", default_model),
-            },
-            "market_analyst": {
-                "llm_provider": os.getenv("LLM_PROVIDER_MARKET", default_provider),
-                "model_name": os.getenv("MODEL_MARKET", default_model),
-            },
-        }
+        self.MODELS = _MODELS
+        self.MESSAGE_OPTIONS = _MESSAGE_OPTIONS
+
+        # Neutralize and extract assumptions in one main-model call
+        self.fuse_neutral_assumptions = os.getenv("FUSE_NEUTRAL_ASSUMPTIONS", "false").lower() in ("1", "true", "yes")
+
+        # Answer critics that share a model with one multi-persona prompt
+        self.batch_critics = os.getenv("BATCH_CRITICS", "false").lower() in ("1", "true", "yes")
+
+        # Skip the judge LLM when at least this many critics flag the same risk (0 disables)
+        self.local_verdict_min_count = int(os.getenv("LOCAL_VERDICT_MIN_COUNT", 4))
+
+        # Main-thread calls (neutralize, judge, follow-ups, history) keep the SDK's 30s timeout
+        self.client = BackboardClient(api_key=self.api_key)
+
+        # Critics get their own client: its HTTP timeout must not cut a critic attempt
+        # short (a batch gets critic_timeout per persona and each retry doubles it)
+        longest_attempt = (
+            self.critic_timeout
+            * (len(_BATCHABLE_CRITICS) if self.batch_critics else 1)
+            * 2 ** (self.critic_attempts - 1)
+        )
+        self.critic_client = BackboardClient(api_key=self.api_key, timeout=max(30, longest_attempt))
+
+        self.models_json: bytes = _MODELS_JSON
 
     async def ensure_assistant(self) -> str:
         """Ensure the Backboard assistant exists (singleton-ish pattern per instance)."""
         if self.assistant_id:
             return str(self.assistant_id)
 
-        # Create assistant once
-        # SDK uses snake_case and is async
-        assistant = await self.client.create_assistant(
-            name="Idea Stress Tester",
-            description=(
-                "Forced adversarial reasoning system: neutralizes optimism bias, "
-                "extracts assumptions, runs 5 persona critics, synthesizes a decisive verdict."
-            )
-        )
+        # Double-checked: concurrent first requests must not each create an assistant
+        async with self._assistant_lock:
+            if self.assistant_id:
+                return str(self.assistant_id)
 
-        # Handle SDK variations
-        _id = getattr(assistant, "id", None) or getattr(assistant, "assistant_id", None)
-        if not _id:
-             # Fallback if it returns dict
-             if isinstance(assistant, dict):
-                 _id = assistant.get("id") or assistant.get("assistant_id")
-        
-        if not _id:
-            raise RuntimeError("Could not read assistantId from Backboard create_assistant response.")
-        
-        self.assistant_id = str(_id)
-        return self.assistant_id
+            # Reuse this app's assistant when it exists, so workers and restarts
+            # don't each leave a new one behind
+            assistant = await self._find_assistant(_ASSISTANT_NAME)
+            if assistant is None:
+                # SDK uses snake_case and is async
+                assistant = await self.client.create_assistant(
+                    name=_ASSISTANT_NAME,
+                    description=(
+                        "Forced adversarial reasoning system: neutralizes optimism bias, "
+                        "extracts assumptions, runs 5 persona critics, synthesizes a decisive verdict."
+                    )
+                )
+
+            # Handle SDK variations
+            _id = _extract(assistant, "id", "assistant_id")
+            if not _id:
+                raise RuntimeError("Could not read assistantId from Backboard create_assistant response.")
+            
+            self.assistant_id = str(_id)
+            return self.assistant_id
 
-    async def run_block_async(self, thread_id: str, content: str, llm_provider: str, model_name: str) -> str:
-        """Async wrapper for the add_message call."""
+    async def _find_assistant(self, name: str) -> Any:
+        """The existing assistant with this name, or None (one filtered list call)."""
+        found = await self.client.list_assistants(name=name, limit=1)
+        return found[0] if found else None
+
+    async def _create_thread_id(self, assistant_id: str) -> str:
+        t = await self.client.create_thread(assistant_id=assistant_id)
+
+        return str(_extract(t, "id", "thread_id") or t) # Fallback: the SDK returned the bare id
+
+    async def _with_retries(self, label: str, make_call: Callable[[], Awaitable[str]], timeout: float) -> str:
+        """
+        Run one critic call, retrying timeouts and transient Backboard errors with
+        exponential backoff (the per-attempt timeout doubles too). Returns "" once
+        every attempt failed, so one stuck provider can't sink the whole stress test.
+        Other errors propagate unchanged.
+        """
+        for attempt in range(self.critic_attempts):
+            if attempt:
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+            try:
+                return await asyncio.wait_for(make_call(), timeout=timeout * 2 ** attempt)
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                logger.warning(
+                    "%s failed (attempt %d/%d): %s",
+                    label, attempt + 1, self.critic_attempts, str(e) or type(e).__name__
+                )
+        return ""
+
+    async def _safe_delete_thread(self, thread_id: str) -> None:
+        try:
+            await self.client.delete_thread(thread_id=thread_id)
+        except Exception as e:
+            logger.warning("Failed to delete temporary thread %s: %s", thread_id, e)
+
+    def _delete_thread_later(self, thread_id: str) -> None:
+        """Delete a finished thread in the background; aclose() waits for pending deletes."""
+        if len(self._pending_deletes) >= self._max_pending_deletes:
+            # Backboard is slow or down: skip this delete rather than let the
+            # backlog of pending tasks grow without bound
+            logger.warning("Too many pending thread deletes; leaving thread %s in place", thread_id)
+            return
+        task = asyncio.ensure_future(self._safe_delete_thread(thread_id))
+        self._pending_deletes.add(task)
+        task.add_done_callback(self._pending_deletes.discard)
+
+    async def run_block_async(
+        self,
+        thread_id: str,
+        content: str,
+        llm_provider: str,
+        model_name: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Async wrapper for the add_message call (options default to MESSAGE_OPTIONS["main"])."""
         # SDK add_message is likely async. If not, we wrap it.
         # Based on previous file, it seemed to be async.
         # Arguments: thread_id, content, model_name, etc.
@@ -102,18 +431,104 @@ class AgentService:
             resp = await self.client.add_message(
                 thread_id=thread_id,
                 content=content,
-                model_name=model_name
+                model_name=model_name,
+                **(self.MESSAGE_OPTIONS["main"] if options is None else options)
             )
         except TypeError:
             # Fallback if arguments differ slightly
             resp = await self.client.add_message(thread_id, content, model_name=model_name)
 
-        # Extract content
-        text = getattr(resp, "content", None) or (resp.get("content") if isinstance(resp, dict) else None)
-        if not text:
-             # Try other fields
-             text = getattr(resp, "message", None) or (resp.get("message") if isinstance(resp, dict) else None)
-             
+        return self._message_text(resp)
+
+    async def run_one_shot_async(
+        self,
+        assistant_id: str,
+        content: str,
+        llm_provider: str,
+        model_name: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Send a prompt on a brand-new thread in a single request (SDK send_message),
+        instead of create_thread + add_message. The thread is deleted afterwards.
+
+        The server creates the thread even if this caller times out or is cancelled,
+        and its id only arrives with the reply, so the request itself is shielded:
+        it finishes in the background and its thread is deleted then.
+        """
+        call = asyncio.ensure_future(self.critic_client.send_message(
+            content,
+            assistant_id=assistant_id,
+            model_name=model_name,
+            **(self.MESSAGE_OPTIONS["main"] if options is None else options)
+        ))
+        self._inflight_one_shots.add(call)
+        call.add_done_callback(self._delete_one_shot_thread)
+        return self._message_text(await asyncio.shield(call))
+
+    def _delete_one_shot_thread(self, call: "asyncio.Future[Any]") -> None:
+        self._inflight_one_shots.discard(call)
+        if call.cancelled() or call.exception() is not None:
+            return
+        t_id = _extract(call.result(), "thread_id")
+        if t_id:
+            self._delete_thread_later(str(t_id))
+
+    async def stream_block_async(
+        self,
+        thread_id: str,
+        content: str,
+        llm_provider: str,
+        model_name: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Like run_block_async, but yields the reply in chunks as it is generated."""
+        resp = await self.client.add_message(
+            thread_id=thread_id,
+            content=content,
+            model_name=model_name,
+            stream=True,
+            **(self.MESSAGE_OPTIONS["main"] if options is None else options)
+        )
+
+        if not hasattr(resp, "__aiter__"):
+            # SDK answered with a complete message instead of an event stream
+            text = self._message_text(resp)
+            if text:
+                yield text
+            return
+
+        async for event in resp:
+            if isinstance(event, dict) and event.get("type") == "content_streaming" and event.get("content"):
+                yield event["content"]
+
+    @staticmethod
+    def llm_cache_key(model_conf: Dict[str, str], content: str) -> str:
+        """Cache key for a stateless prompt sent to a specific provider/model."""
+        payload = json.dumps(
+            {"provider": model_conf["llm_provider"], "model": model_conf["model_name"], "content": content},
+            sort_keys=True
+        )
+        return "llm:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        try:
+            return await self.llm_cache.get(key)
+        except Exception as e:
+            # A cache outage must never fail the stress test
+            logger.warning("LLM cache read failed: %s", e)
+            return None
+
+    async def _cache_set(self, key: str, value: str) -> None:
+        try:
+            await self.llm_cache.set(key, value, ttl=self.llm_cache_ttl)
+        except Exception as e:
+            logger.warning("LLM cache write failed: %s", e)
+
+    @staticmethod
+    def _message_text(resp: Any) -> str:
+        """Extract the reply text from an add_message response."""
+        text = _extract(resp, "content", "message")
         if not text:
             return "" 
         return str(text).strip()
@@ -121,77 +536,59 @@ class AgentService:
     # --- Logic Helpers ---
 
     def normalize_text(self, s: str) -> str:
-        s = (s or "").lower()
-        s = re.sub(r"[^a-z0-9\s]", " ", s)
-        s = re.sub(r"\s+", " ", s).strip()
-        return s
-
-    def text_hits_theme(self, text: str, patterns: List[Any]) -> bool:
-        t = self.normalize_text(text)
-        for p in patterns:
-            if isinstance(p, str):
-                if p in t:
-                    return True
-            else:
-                if p.search(t):
-                    return True
-        return False
-
-    def compute_risk_signals(self, critics: Dict[str, str], threshold: int = 3) -> Dict[str, Any]:
-        themes = [
-            {
-                "key": "distribution_adoption",
-                "label": "Distribution / adoption friction",
-                "patterns": ["distribution", "acquisition", "marketing", "onboarding", "adoption", "retention", "growth", re.compile(r"go to market")],
-            },
-            {
-                "key": "trust_credibility",
-                "label": "Trust / credibility",
-                "patterns": ["trust", "credible", "accuracy", "hallucination", "reliability", "confidence", "wrong", "false", "misleading"],
-            },
-            {
-                "key": "privacy_compliance",
-                "label": "Privacy / compliance risk",
-                "patterns": ["privacy", "pii", "gdpr", "hipaa", "consent", "compliance", "data leak", "breach", "sensitive"],
-            },
-            {
-                "key": "security_abuse",
-                "label": "Security / misuse / abuse",
-                "patterns": ["security", "abuse", "misuse", "fraud", "spam", "scam", "attack", "prompt injection", "jailbreak"],
-            },
-            {
-                "key": "moat_competition",
-                "label": "Weak moat / competition will copy",
-                "patterns": ["moat", "defensible", "differentiation", "commodity", "copy", "clone", "competition", "incumbent"],
-            },
-            {
-                "key": "scalability_cost",
-                "label": "Scalability / cost",
-                "patterns": ["scale", "scalability", "latency", "cost", "token", "inference", "throughput", "rate limit"],
-            },
-            {
-                "key": "product_scope",
-                "label": "Too broad / unclear scope",
-                "patterns": ["scope", "too broad", "vague", "unclear", "who is this for", "not specific", "undefined"],
-            },
-        ]
-
-        theme_counts = {t["key"]: 0 for t in themes}
-        mentions = {t["key"]: [] for t in themes}
+        """Lowercase ASCII words only, for theme scanning (lossy: never use it as a cache key)."""
+        return " ".join((s or "").lower().translate(_NORM_TABLE).split())
+
+    def fold_text(self, s: str) -> str:
+        """Case- and whitespace-folded text that keeps every other character."""
+        return " ".join((s or "").casefold().split())
+
+    def idea_cache_key(self, idea: str) -> str:
+        """Stable cache key for an idea, insensitive to case/whitespace."""
+        return hashlib.blake2b(self.fold_text(idea).encode(), digest_size=16).hexdigest()
+
+    def matched_themes(self, text: str) -> Set[int]:
+        """Return the _THEMES indices of every risk theme mentioned in the text."""
+        seen = set()
+        for m in _THEME_SCANNER.finditer(self.normalize_text(text)):
+            seen.add(_THEME_INDEX[m.lastgroup])
+            if len(seen) == len(_THEMES):
+                break
+        return seen
+
+    def compute_risk_signals(
+        self,
+        critics: Dict[str, str],
+        threshold: int = 3,
+        theme_hits: Optional[Dict[str, Set[int]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Count how many personas mention each risk theme. theme_hits may carry
+        matched_themes() results already computed per persona (e.g. while other
+        critics were still running); only the remaining texts are scanned.
+        """
+        theme_hits = theme_hits or {}
+
+        # Parallel lists indexed like _THEMES; dicts are only built for the response
+        counts = [0] * len(_THEMES)
+        mentions: List[List[str]] = [[] for _ in _THEMES]
 
         for persona, txt in critics.items():
-            for th in themes:
-                if self.text_hits_theme(txt, th["patterns"]):
-                    theme_counts[th["key"]] += 1
-                    mentions[th["key"]].append(persona)
-
-        ranked = sorted(
-            [{"key": th["key"], "label": th["label"], "count": theme_counts[th["key"]], "personas": mentions[th["key"]]} for th in themes],
-            key=lambda x: x["count"],
-            reverse=True,
-        )
+            hits = theme_hits.get(persona)
+            for i in (hits if hits is not None else self.matched_themes(txt)):
+                counts[i] += 1
+                mentions[i].append(persona)
+
+        theme_counts = {th.key: counts[i] for i, th in enumerate(_THEMES)}
+
+        def entry(i: int) -> Dict[str, Any]:
+            th = _THEMES[i]
+            return {"key": th.key, "label": th.label, "count": counts[i], "personas": mentions[i]}
 
-        high_conf = [x for x in ranked if x["count"] >= threshold]
+        # Highest count first; ties keep table order (same as a stable descending sort)
+        rank_key = lambda i: (counts[i], -i)
+        top_themes = [entry(i) for i in heapq.nlargest(3, range(len(_THEMES)), key=rank_key)]
+        high_conf = [entry(i) for i in sorted((i for i in range(len(_THEMES)) if counts[i] >= threshold), key=rank_key, reverse=True)]
         confidence_note = (
             f"High confidence risk: {high_conf[0]['label']} (mentioned by {high_conf[0]['count']}/5 personas)."
             if high_conf else
@@ -199,37 +596,170 @@ class AgentService:
         )
 
         return {
-            "topThemes": ranked[:3],
+            "topThemes": top_themes,
             "highConfidenceRisks": high_conf,
             "themeCounts": theme_counts,
             "threshold": threshold,
             "confidenceNote": confidence_note,
         }
 
+    def local_verdict(self, risk_signals: Dict[str, Any], critics: Dict[str, str], assumptions_txt: str) -> Optional[str]:
+        """
+        Build the verdict locally when the critics converge on one high-confidence
+        risk, so the final judge call can be skipped. Returns None otherwise.
+        """
+        if not self.local_verdict_min_count or not risk_signals["highConfidenceRisks"]:
+            return None
+        top = risk_signals["topThemes"][0]
+        if top["count"] < self.local_verdict_min_count:
+            return None
+
+        label = top["label"]
+        assumptions = _NUMBERED_LINE.findall(assumptions_txt or "")[:3]
+        kill_signal = _critic_field(critics.get("vc", ""), "KILL SIGNAL")
+        dealbreaker = _critic_field(critics.get("user", ""), "DEALBREAKER")
+        min_build = _critic_field(critics.get("engineer", ""), "MINIMUM BUILD")
+        convince = _critic_field(critics.get("user", ""), "WHAT WOULD CONVINCE ME")
+        pivot = (
+            _critic_field(critics.get("vc", ""), "ONE RECOMMENDATION")
+            or _critic_field(critics.get("ethicist", ""), "REQUIRED SAFEGUARD")
+        )
+
+        if kill_signal:
+            kill_question = f"Is this already true: {_clause(kill_signal)}?"
+        elif dealbreaker:
+            kill_question = f'What stops target users from walking away over "{_clause(dealbreaker)}"?'
+        else:
+            kill_question = f"What evidence shows {label.lower()} will not sink this before launch?"
+
+        return LOCAL_VERDICT_TEMPLATE.format(
+            failure_mode=f"{label}, flagged independently by {top['count']} critics ({', '.join(top['personas'])}).",
+            assumptions="\n".join(f"{i}) {a}" for i, a in enumerate(assumptions, 1)) or f"1) Target users will accept the {label.lower()} trade-off.",
+            kill_question=kill_question,
+            demo_angle=f"Show the first build end to end: {_clause(min_build)}." if min_build else f"Show the one workflow that neutralizes {label.lower()}.",
+            experiment=(
+                f"Put this in front of 10 target users: {_clause(convince)}. Success = 3+ commit (sign up, pay or pre-order)."
+                if convince else
+                f"Interview 10 target users about {label.lower()}. Success = 3+ commit (sign up, pay or pre-order)."
+            ),
+            pivot=f"{_clause(pivot)}." if pivot else f"Redesign the offer so {label.lower()} is solved by default rather than mitigated later."
+        )
+
+    @staticmethod
+    def _stress_test_record(neutral: str, assumptions: str, critics: Dict[str, str], verdict: str) -> str:
+        """One message with the given stress test parts, for _record_in_thread. Empty parts are left out."""
+        sections = [("Neutral Idea", neutral), ("Assumptions", assumptions)]
+        sections.extend((_CRITIC_LABELS.get(name, name), text) for name, text in critics.items())
+        sections.append(("Verdict", verdict))
+        return "\n\n".join(f"{label}:\n{text}" for label, text in sections if text)
+
+    async def _record_in_thread(self, thread_id: str, content: str) -> None:
+        """Store content in the thread without an LLM call, so follow-ups can see it."""
+        try:
+            await self.client.add_message(thread_id=thread_id, content=content, send_to_llm="false")
+        except Exception as e:
+            logger.warning("Failed to record message in thread %s: %s", thread_id, e)
+
     # --- Prompts ---
 
-    def _build_prompts(self, idea: str) -> Dict[str, Any]:
-        """Generate prompt templates injected with the idea."""
-        # Note: In a real app, these might be loaded from files or a DB.
-        
-        return {
-            "bias_remover": f"""Rewrite the idea below in neutral, factual language.\nRules:\n- Remove adjectives, hype, and assumptions of success.\n- Convert vague claims into testable statements.\n- Keep it to 3–6 sentences.\nReturn ONLY the rewritten idea.\n\nIdea:\n{idea}""",
-            "assumptions": lambda neutral: f"""Extract the hidden assumptions that must be true for this idea to succeed.\nRules:\n- Only necessary assumptions (not nice-to-have).\n- Phrase each as falsifiable.\n- 8–12 max.\n\nReturn as a numbered list.\n\nIdea:\n{neutral}""",
-            "vc": lambda neutral: f"""Persona: Skeptical VC\nAttack: market size, moat, monetization\n\nDeliver exactly:\n- MARKET RISKS: (2 bullets)\n- MOAT & DEFENSE: (2 bullets)\n- KILL SIGNAL: (1 metric that proves this is dead)\n- ONE RECOMMENDATION: (1 specific action)\n\nBe blunt and specific.\n\nIdea:\n{neutral}""",
-            "engineer": lambda neutral: f"""Persona: Senior Engineer\nAttack: scalability, edge cases, reliability\n\nDeliver exactly:\n- SYSTEM RISKS: (2 bullets)\n- EDGE CASES: (2 bullets)\n- SCALING BOTTLENECK: (1 specific bottleneck)\n- MINIMUM BUILD: (1 critical feature to build first)\n\nBe concrete. No generic advice.\n\nIdea:\n{neutral}""",
-            "ethicist": lambda neutral: f"""Persona: Ethicist / Safety Reviewer\nAttack: harm, bias, misuse, privacy\n\nDeliver exactly:\n- HARMS & BIAS: (2 bullets)\n- MISUSE SCENARIOS: (2 bullets)\n- DATA PRIVACY: (1 specific risk)\n- REQUIRED SAFEGUARD: (1 mandatory control)\n\nDon’t moralize. Be practical.\n\nIdea:\n{neutral}""",
-            "user": lambda neutral: f"""Persona: Real User (impatient, skeptical)\nAttack: adoption friction, trust, workflow fit\n\nDeliver exactly:\n- ADOPTION FRICTION: (2 bullets)\n- TRUST ISSUES: (2 bullets)\n- DEALBREAKER: (1 reason I won't sign up)\n- WHAT WOULD CONVINCE ME: (1 feature/change)\n\nIdea:\n{neutral}""",
-            "competitor": lambda neutral: f"""Persona: Competitor Strategy Lead\nAttack: why we’ll crush you\n\nDeliver exactly:\n- COMPETITIVE ADVANTAGE: (2 bullets on why we win)\n- COPYCAT STRATEGY: (2 bullets on how we copy you)\n- YOUR WEAKNESS: (1 critical flaw)\n- DEFENSIVE MOVE: (1 thing you must do)\n\nBe ruthless.\n\nIdea:\n{neutral}""",
-            "market_analyst": lambda neutral: f"""Persona: Elite Market Analyst\nTask: Competitive Landscape & Capital Requirements\n\n1. COMPETITORS:\nList 3-5 **direct functional competitors** that offer the **exact same core value proposition**.\n- Do NOT list generic platforms (e.g., LinkedIn, Google, Indeed) unless they have this specific automation feature natively.\n- Focus on specific startups, Chrome extensions, or AI tools that solve this EXACT problem.\n\nFor each, provide:\n- Name\n- Success Score (1-10)\n- Est. Metric (Revenue, Users, or Valuation)\n- "How they crush you" (1 sentence)\n\nFormat as a Markdown Table.\n\n2. CAPITAL REQUIREMENTS:\nEstimate the round need (Pre-Seed, Seed, Series A) and amount ($X - $Y) to be competitive.\nProvide a 1-sentence rationale.\n\nIdea:\n{neutral}""",
-            "final_judge": lambda neutral, assume, critics: f"""You are an independent hackathon judge.\nSynthesize the critics below into a decisive verdict.\n\nReturn in this exact format:\n\nPRIMARY FAILURE MODE:\n- (one sentence)\n\nTOP 3 ASSUMPTIONS TO TEST:\n1) ...\n2) ...\n3) ...\n\nKILL QUESTION:\n- (one question)\n\nWINNING DEMO ANGLE:\n- (one sentence: how to demo this in 30 seconds)\n\n48-HOUR VALIDATION EXPERIMENT:\n- (one experiment + success metric)\n\nONE PIVOT TO MAKE THIS A WINNER:\n- (one sentence)\n\nINPUTS\nNeutral Idea:\n{neutral}\n\nAssumptions:\n{assume}\n\nVC:\n{critics.get("vc", "Skipped")}\n\nEngineer:\n{critics.get("engineer", "Skipped")}\n\nEthicist:\n{critics.get("ethicist", "Skipped")}\n\nUser:\n{critics.get("user", "Skipped")}\n\nCompetitor:\n{critics.get("competitor", "Skipped")}""",
-        }
+    def critic_batches(self, critics_to_run: List[str]) -> List[List[str]]:
+        """
+        Groups of critics to answer with one multi-persona prompt each: batchable
+        personas grouped by (provider, model), keeping groups of 2 or more.
+        Empty unless BATCH_CRITICS is set; everything else runs separately.
+        """
+        if not self.batch_critics:
+            return []
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for name in critics_to_run:
+            if name in _BATCHABLE_CRITICS:
+                conf = self.MODELS[name]
+                groups.setdefault((conf["llm_provider"], conf["model_name"]), []).append(name)
+        return [names for names in groups.values() if len(names) >= 2]
+
+    def _render_batch_prompt(self, names: List[str], neutral: str) -> str:
+        """Fill BATCH_CRITIC_TEMPLATE with each persona's instructions (minus its idea suffix)."""
+        sections = "\n\n".join(
+            f"=== PERSONA: {name} ===\n{PROMPT_TEMPLATES[name][:-len(_IDEA_SUFFIX)]}" for name in names
+        )
+        return BATCH_CRITIC_TEMPLATE.format(names=", ".join(names), sections=sections, neutral=neutral)
+
+    @staticmethod
+    def split_fused_reply(text: str) -> Tuple[str, str]:
+        """Split a neutral_and_assumptions reply into (neutral idea, assumptions); ("", "") if malformed."""
+        head, sep, assumptions = (text or "").partition("===ASSUMPTIONS===")
+        neutral = head.replace("===NEUTRAL===", "", 1).strip()
+        assumptions = assumptions.strip()
+        if not (sep and neutral and assumptions):
+            return "", ""
+        return neutral, assumptions
+
+    @staticmethod
+    def split_batch_reply(text: str, names: List[str]) -> Dict[str, str]:
+        """Map persona name -> section body for every non-empty, expected section."""
+        parts = _PERSONA_MARKER.split(text or "")
+        # parts = [preamble, name1, body1, name2, body2, ...]
+        sections: Dict[str, str] = {}
+        for name, body in zip(parts[1::2], parts[2::2]):
+            body = body.strip()
+            # A marker the pattern still missed would glue the next persona onto this one
+            if "=== PERSONA:" in body:
+                continue
+            if name in names and body and name not in sections:
+                sections[name] = body
+        return sections
+
+    def _render_judge_prompt(self, neutral: str, assume: str, critics: Dict[str, str]) -> str:
+        # Critic replies go in as-is; only empty or unselected ones fall back to "Skipped"
+        fields = _JudgeFields((name, text) for name, text in critics.items() if text)
+        fields["neutral"] = neutral
+        fields["assume"] = assume
+        return PROMPT_TEMPLATES["final_judge"].format_map(fields)
+
+    def _render_prompt(self, name: str, **fields: str) -> str:
+        """Fill a module-level prompt template."""
+        return PROMPT_TEMPLATES[name].format(**fields)
 
     # --- Main Workflow ---
 
-    async def run_stress_test(self, idea_text: str, thread_id: Optional[str] = None, selected_critics: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def run_stress_test(
+        self,
+        idea_text: str,
+        thread_id: Optional[str] = None,
+        selected_critics: Optional[List[str]] = None,
+        force_verdict_llm: bool = False,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Execute the full agentic stress test workflow.
         """
+        result: Dict[str, Any] = {}
+        async for event in self.iter_stress_test(
+            idea_text, thread_id, selected_critics, force_verdict_llm=force_verdict_llm, use_cache=use_cache
+        ):
+            if event["phase"] == "done":
+                result = event["result"]
+        return result
+
+    async def iter_stress_test(
+        self,
+        idea_text: str,
+        thread_id: Optional[str] = None,
+        selected_critics: Optional[List[str]] = None,
+        stream_verdict: bool = False,
+        force_verdict_llm: bool = False,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the stress test workflow, yielding an event as each phase completes.
+
+        Events are dicts keyed by "phase": start, neutral, then assumptions and critic
+        (one per persona) in completion order, risk_signals, verdict_delta (only when
+        stream_verdict is set), verdict and finally done, which carries the full result.
+        The judge LLM is skipped when the critics converge on one risk, unless
+        force_verdict_llm is set. use_cache=False ignores cached neutral/critic
+        replies (fresh results still refresh the caches).
+        """
         assistant_id = await self.ensure_assistant()
         
         # Create thread if new
@@ -238,9 +768,7 @@ class AgentService:
             thread = await self.client.create_thread(assistant_id=assistant_id)
             
             # Unpack thread ID (handling diff SDK versions/responses)
-            thread_id = getattr(thread, "id", None) or getattr(thread, "thread_id", None)
-            if not thread_id and isinstance(thread, dict):
-                thread_id = thread.get("id") or thread.get("thread_id")
+            thread_id = _extract(thread, "id", "thread_id")
             
             if not thread_id:
                 if isinstance(thread, str):
@@ -249,50 +777,69 @@ class AgentService:
                     raise RuntimeError("Could not create threadId via create_thread.")
         
         thread_id = str(thread_id)
+        yield {"phase": "start", "thread_id": thread_id, "assistant_id": assistant_id}
 
-        P = self._build_prompts(idea_text)
-        
-        # 1. Neutralize Hype
-        neutral_idea = await self.run_block_async(
-            thread_id, 
-            P["bias_remover"], 
-            self.MODELS["main"]["llm_provider"], 
-            self.MODELS["main"]["model_name"]
-        )
+        # 1. Neutralize Hype (memoized with the assumptions per normalized idea)
+        neutral_key = self.idea_cache_key(idea_text)
+        cached: Optional[Tuple[str, str]] = self._neutral_cache.get(neutral_key) if use_cache else None
+        if cached:
+            neutral_idea, assumptions_txt = cached
+        else:
+            neutral_idea, assumptions_txt = "", ""
+            if self.fuse_neutral_assumptions:
+                # One call for both main-model steps; a reply that doesn't follow
+                # the format falls back to the regular two-call path
+                neutral_idea, assumptions_txt = self.split_fused_reply(await self.run_block_async(
+                    thread_id,
+                    self._render_prompt("neutral_and_assumptions", idea=idea_text),
+                    self.MODELS["main"]["llm_provider"],
+                    self.MODELS["main"]["model_name"]
+                ))
+                if not neutral_idea:
+                    logger.warning("Fused neutral/assumptions reply not in the expected format; retrying separately")
+            if not neutral_idea:
+                neutral_idea = await self.run_block_async(
+                    thread_id, 
+                    self._render_prompt("bias_remover", idea=idea_text),
+                    self.MODELS["main"]["llm_provider"], 
+                    self.MODELS["main"]["model_name"]
+                )
+
+        yield {"phase": "neutral", "text": neutral_idea}
+        if assumptions_txt:
+            yield {"phase": "assumptions", "text": assumptions_txt}
 
         # 2. Extract Assumptions
-        assumptions_txt = await self.run_block_async(
-            thread_id,
-            P["assumptions"](neutral_idea),
-            self.MODELS["main"]["llm_provider"],
-            self.MODELS["main"]["model_name"]
-        )
+        # Only the verdict consumes them, so they run in the same wave as the critics
+        async def _run_assumptions() -> List[Tuple[str, str]]:
+            return [("assumptions", await self.run_block_async(
+                thread_id,
+                self._render_prompt("assumptions", neutral=neutral_idea),
+                self.MODELS["main"]["llm_provider"],
+                self.MODELS["main"]["model_name"]
+            ))]
 
         # 3. Parallel Critics
         # We must run each critic in a Separate Thread to avoid "Assistant is processing" locking issues
         async def _run_isolated_critic(prompt: str, model_conf: Dict[str, str]) -> str:
-            # Create a localized thread for this critic
-            t = await self.client.create_thread(assistant_id=assistant_id)
-            
-            t_id = getattr(t, "id", None) or getattr(t, "thread_id", None)
-            if not t_id and isinstance(t, dict): t_id = t.get("id") or t.get("thread_id")
-            if not t_id: t_id = str(t) # Fallback
+            # Critics are stateless one-shot prompts, so an identical (model, prompt)
+            # pair can be answered from cache without touching Backboard at all
+            cache_key = self.llm_cache_key(model_conf, prompt)
+            cached = await self._cache_get(cache_key) if use_cache else None
+            if cached:
+                return cached
 
-            t_id_str = str(t_id)
-            
-            try:
-                return await self.run_block_async(
-                    t_id_str,
-                    prompt,
-                    model_conf["llm_provider"],
-                    model_conf["model_name"]
-                )
-            finally:
-                # Cleanup: Delete the temporary thread
-                try:
-                    await self.client.delete_thread(thread_id=t_id_str)
-                except Exception as e:
-                    print(f"Warning: Failed to delete temporary thread {t_id_str}: {e}")
+            # A fresh thread per call, created with the message and deleted afterwards
+            text = await self.run_one_shot_async(
+                assistant_id,
+                prompt,
+                model_conf["llm_provider"],
+                model_conf["model_name"],
+                options=self.MESSAGE_OPTIONS["critic"]
+            )
+            if text:
+                await self._cache_set(cache_key, text)
+            return text
 
         # Determine which critics to run
         available_critics = ["vc", "engineer", "ethicist", "user", "competitor", "market_analyst"]
@@ -311,35 +858,100 @@ class AgentService:
             # If user passed empty list (and market_analyst wasn't there somehow, though added above)? 
             # With the addition above, it will never be empty.
 
-        critic_tasks = []
-        for name in critics_to_run:
-            # Construct prompt
-            prompt_func = P[name]
-            # All critic prompts in _build_prompts are lambdas taking `neutral_idea`
-            prompt = prompt_func(neutral_idea)
-            
-            critic_tasks.append(_run_isolated_critic(prompt, self.MODELS[name]))
+        async def _run_named_critic(name: str) -> List[Tuple[str, str]]:
+            # All critic prompts take the neutralized idea
+            prompt = self._render_prompt(name, neutral=neutral_idea)
+            text = await self._with_retries(
+                f"Critic '{name}'",
+                lambda: _run_isolated_critic(prompt, self.MODELS[name]),
+                self.critic_timeout
+            )
+            return [(name, text)]
+
+        async def _run_batched_critics(names: List[str]) -> List[Tuple[str, str]]:
+            # One call answers every persona; a section the model dropped or
+            # garbled is re-asked on its own so the result is always complete
+            prompt = self._render_batch_prompt(names, neutral_idea)
+            text = await self._with_retries(
+                f"Batched critics {names}",
+                lambda: _run_isolated_critic(prompt, self.MODELS[names[0]]),
+                self.critic_timeout * len(names)
+            )
+            sections = self.split_batch_reply(text, names)
+            missing = [name for name in names if name not in sections]
+            if missing:
+                logger.warning("Batched critic reply missing %s; asking them individually", missing)
+                for pairs in await asyncio.gather(*[_run_named_critic(name) for name in missing]):
+                    sections.update(pairs)
+            return [(name, sections[name]) for name in names]
+
+        # Run valid critics (and uncached assumptions) in parallel, reporting each as soon as it lands
+        batches = self.critic_batches(critics_to_run)
+        batched = {name for names in batches for name in names}
+        wave = [asyncio.ensure_future(_run_named_critic(name)) for name in critics_to_run if name not in batched]
+        wave.extend(asyncio.ensure_future(_run_batched_critics(names)) for names in batches)
+        if not assumptions_txt:
+            wave.append(asyncio.ensure_future(_run_assumptions()))
+
+        results: Dict[str, str] = {}
+        # Theme scan of each critic as it lands, overlapping the slower critics' latency
+        theme_hits: Dict[str, Set[int]] = {}
+        try:
+            for next_done in asyncio.as_completed(wave):
+                for name, text in await next_done:
+                    if name == "assumptions":
+                        assumptions_txt = text
+                        yield {"phase": "assumptions", "text": text}
+                        continue
+                    results[name] = text
+                    yield {"phase": "critic", "persona": name, "text": text}
+                    theme_hits[name] = self.matched_themes(text)
+        finally:
+            # Fail fast: one failed critic (or a disconnected stream client) dooms the
+            # whole response, so stop paying for the calls still in flight
+            for task in wave:
+                task.cancel()
 
-        # Run valid critics in parallel
-        results = await asyncio.gather(*critic_tasks)
+        if not cached and neutral_idea and assumptions_txt:
+            self._neutral_cache.set(neutral_key, (neutral_idea, assumptions_txt))
 
-        # Map back to names
-        critics = {}
-        for i, name in enumerate(critics_to_run):
-            critics[name] = results[i]
+        # Map back to names (in selection order, not completion order)
+        critics = {name: results[name] for name in critics_to_run}
+        # A critic that gave up after its retries comes back empty; such a run is
+        # returned as-is but must not be served again from any cache
+        degraded = not all(critics.values())
 
         # 4. Compute Risk Signals (Local Python)
-        risk_signals = self.compute_risk_signals(critics)
+        risk_signals = self.compute_risk_signals(critics, theme_hits=theme_hits)
+        yield {"phase": "risk_signals", "data": risk_signals}
 
         # 5. Final Verdict
-        verdict = await self.run_block_async(
-            thread_id,
-            P["final_judge"](neutral_idea, assumptions_txt, critics),
-            self.MODELS["main"]["llm_provider"],
-            self.MODELS["main"]["model_name"]
-        )
+        verdict = None if force_verdict_llm else self.local_verdict(risk_signals, critics, assumptions_txt)
+        verdict_source = "local"
+        if verdict is None:
+            judge_prompt = self._render_judge_prompt(neutral_idea, assumptions_txt, critics)
+            # Same neutral idea, assumptions and critiques -> same judge prompt
+            verdict_key = self.llm_cache_key(self.MODELS["main"], judge_prompt)
+            verdict = await self._cache_get(verdict_key) if use_cache else None
+            verdict_source = "cache"
 
-        return {
+        if verdict is not None:
+            # Neither this verdict nor the critiques (each from its own thread), nor a
+            # cached neutral idea and assumptions, were generated in this thread; the
+            # judge prompt would have carried them, so record them for follow-ups
+            prior = (neutral_idea, assumptions_txt) if cached else ("", "")
+            await self._record_in_thread(thread_id, self._stress_test_record(*prior, critics, verdict))
+            yield {"phase": "verdict", "text": verdict, "source": verdict_source}
+        else:
+            verdict_source = "llm"
+            async for event in self._judge_verdict(thread_id, judge_prompt, stream_verdict):
+                if event["phase"] == "verdict":
+                    verdict = event["text"]
+                yield event
+            if verdict and not degraded:
+                await self._cache_set(verdict_key, verdict)
+
+        yield {"phase": "done", "result": {
             "thread_id": thread_id,
             "assistant_id": assistant_id,
             "input_idea": idea_text,
@@ -350,9 +962,46 @@ class AgentService:
             "market_analysis": critics["market_analyst"],
             "verdict": verdict,
             "meta": {
-                "models": self.MODELS
+                "models": self.MODELS,
+                "verdict_source": verdict_source,
+                "degraded": degraded
             }
-        }
+        }}
+
+    async def _judge_verdict(self, thread_id: str, judge_prompt: str, stream_verdict: bool) -> AsyncIterator[Dict[str, Any]]:
+        """Ask the final judge for the verdict, yielding verdict_delta events when streaming."""
+        if stream_verdict:
+            chunks: List[str] = []
+            async for chunk in self.stream_block_async(
+                thread_id,
+                judge_prompt,
+                self.MODELS["main"]["llm_provider"],
+                self.MODELS["main"]["model_name"]
+            ):
+                chunks.append(chunk)
+                yield {"phase": "verdict_delta", "text": chunk}
+            verdict = "".join(chunks).strip()
+        else:
+            verdict = await self.run_block_async(
+                thread_id,
+                judge_prompt,
+                self.MODELS["main"]["llm_provider"],
+                self.MODELS["main"]["model_name"]
+            )
+        yield {"phase": "verdict", "text": verdict, "source": "llm"}
+
+    async def fork_thread(self, result: Dict[str, Any]) -> str:
+        """
+        Start a new thread holding a finished stress test result (recorded, no LLM
+        call), for a submitter served someone else's result, so follow-ups and
+        history are not shared with the thread the result was computed in.
+        """
+        assistant_id = await self.ensure_assistant()
+        thread_id = await self._create_thread_id(assistant_id)
+        await self._record_in_thread(thread_id, self._stress_test_record(
+            result["neutral_idea"], result["assumptions"], result["critics"], result["verdict"]
+        ))
+        return thread_id
 
     async def ask_follow_up(self, thread_id: str, question: str) -> str:
         """
@@ -366,16 +1015,70 @@ class AgentService:
             self.MODELS["main"]["model_name"]
         )
 
+    async def get_history(self, thread_id: str) -> List[Dict[str, Any]]:
+        """
+        Return the messages of a thread as plain dicts (role, content, created_at).
+        Raises LookupError if the thread does not exist, ValueError if the id is malformed.
+        """
+        cached = self._history_cache.get(thread_id)
+        if cached is not None:
+            return cached
+
+        try:
+            thread = await self.client.get_thread(thread_id=thread_id)
+        except BackboardNotFoundError:
+            raise LookupError(f"Thread {thread_id} not found")
+        except BackboardValidationError as e:
+            raise ValueError(f"Invalid thread id {thread_id}: {e}")
+
+        messages = []
+        for msg in _extract(thread, "messages") or []:
+            role = _extract(msg, "role")
+            created_at = _extract(msg, "created_at")
+            messages.append({
+                "role": getattr(role, "value", role),
+                "content": _extract(msg, "content") or "",
+                "created_at": created_at.isoformat() if hasattr(created_at, "isoformat") else created_at,
+            })
+        self._history_cache.set(thread_id, messages)
+        return messages
+
     def health_check(self) -> bool:
         """Check if client and config are valid."""
         return self.client is not None and self.api_key is not None
 
+    async def aclose(self) -> None:
+        """Delete used critic threads, then close the Backboard clients and the LLM cache."""
+        # A finishing critic call schedules its thread's delete, so loop until drained
+        while self._inflight_one_shots or self._pending_deletes:
+            await asyncio.gather(*self._inflight_one_shots, *self._pending_deletes, return_exceptions=True)
+
+        for client in (self.client, self.critic_client):
+            close = getattr(client, "aclose", None)
+            if close is not None:
+                await close()
+        await self.llm_cache.aclose()
 
-# Singleton
-_agent_service = None
 
+# Singleton (a failed construction, e.g. missing API key, is not cached)
+@functools.lru_cache(maxsize=1)
 def get_agent_service() -> AgentService:
-    global _agent_service
-    if not _agent_service:
-        _agent_service = AgentService()
-    return _agent_service
+    return AgentService()
+
+
+async def warm_up_agent_service() -> None:
+    """
+    Create the assistant before the first request. Best effort: on failure the
+    first request simply does it.
+    """
+    try:
+        await get_agent_service().ensure_assistant()
+    except Exception as e:
+        logger.warning("Backboard warm-up failed; deferring to first request: %s", e)
+
+
+async def shutdown_agent_service() -> None:
+    """Release the singleton's resources (no-op if it was never created)."""
+    if get_agent_service.cache_info().currsize:
+        await get_agent_service().aclose()
+        get_agent_service.cache_clear()
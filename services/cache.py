@@ -0,0 +1,109 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Protocol, Tuple
+
+# Optional shared backend
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+class LRUCache:
+    """
+    Small in-process LRU cache used to memoize pure LLM workflow steps.
+    Entries optionally expire `ttl` seconds after they were stored.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it recently used) or None."""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return None
+        expires_at, value = self._data[key]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(Protocol):
+    """Async string key/value store used for cross-request LLM response caching."""
+
+    # True when every worker (and restarts) see the same entries
+    shared: bool
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Per-process backend (each uvicorn worker has its own copy).
+    """
+
+    shared = False
+
+    def __init__(self, maxsize: int = 1024):
+        self._cache = LRUCache(maxsize=maxsize)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """
+    Redis backend, shared by all workers and surviving restarts.
+    """
+
+    shared = True
+
+    def __init__(self, url: str):
+        if aioredis is None:
+            raise ImportError("redis not installed. Please install it to use REDIS_URL.")
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._redis.set(key, value, ex=ttl)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+def make_cache_backend() -> CacheBackend:
+    """Redis when REDIS_URL is set, otherwise an in-process LRU."""
+    url = os.getenv("REDIS_URL")
+    if url:
+        return RedisBackend(url)
+    return MemoryBackend(maxsize=int(os.getenv("LLM_CACHE_SIZE", 1024)))